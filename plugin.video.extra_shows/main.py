@@ -18,9 +18,17 @@ Example video plugin that is compatible with Kodi 20.x "Nexus" and above
 
 from __future__ import annotations
 
+import hashlib
+import os
+import pickle
 import re
+import string
 import sys
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+import xml.etree.ElementTree as ET
 from pathlib import Path
 
 import xbmc
@@ -28,60 +36,232 @@ import xbmcgui
 import xbmcplugin
 from xbmcaddon import Addon
 from xbmcvfs import translatePath
-from resources.Lib import xmltodict
 
 SHOW_PATH = Path('C:/test tvshow')
 # Get the plugin url in plugin:// notation.
 URL = sys.argv[0]
 # Get a plugin handle as an integer number.
 HANDLE = int(sys.argv[1])
+# Get addon info from a single Addon instance
+ADDON = Addon()
 # Get addon base path
-ADDON_PATH = Path(translatePath(Addon().getAddonInfo('path')))
-ADDON_NAME = Addon().getAddonInfo('name')
-VIDEO_FORMATS = ['.mkv', '.mp4', '.avi', '.wtv']
+ADDON_PATH = Path(translatePath(ADDON.getAddonInfo('path')))
+ADDON_NAME = ADDON.getAddonInfo('name')
+# Get addon data folder, used for the nfo cache
+ADDON_PROFILE = Path(translatePath(ADDON.getAddonInfo('profile')))
+# characters that never need percent-encoding in a url query value
+URL_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + '-._~')
+# only format log messages when Kodi debug logging is enabled
+DEBUG_LOG = xbmc.getCondVisibility('System.GetBool(debug.showloginfo)')
+# in order of preference when an episode has more than one video file
+VIDEO_FORMATS = ('.mkv', '.mp4', '.avi', '.wtv')
+# the suffixes recorded when scanning an episodes folder
+EPISODE_SUFFIXES = frozenset(VIDEO_FORMATS + ('.nfo',))
+# local art images looked for in a tv show folder (as used by list_shows)
+ART_TYPES = frozenset(('fanart', 'poster'))
+ART_FORMATS = ('.jpg', '.png')
+# the nfo elements read by add_show_data / add_episode_data
+NFO_FIELDS = ('title', 'plot', 'premiered', 'aired', 'year')
+# matches SxxEyy in an episode filename, eg 'Show S01E02' or 's01.e02'
+SXX_EYY_RE = re.compile(r'[sS](\d+)[^a-zA-Z]*[eE](\d+)')
+
+# worker threads used to read show folders / nfo files concurrently
+MAX_WORKERS = 8
 
 # SHOW_PATH is a source folder for tv shows.  TV Shows
 # should be in Kodi format with matching nfo files
 # Only video files with VIDEO_FORMATS are recognized:
 # not iso / dvd/bd folders, rar etc.
 
-def logit(msg:str):
-    """utility Kodi logging
+def logit(msg:str | Callable[[], str]):
+    """utility Kodi logging, a no-op unless debug logging is enabled
 
     Args:
-        msg (str): message to log
+        msg (str | Callable[[], str]): message to log, or a callable
+            returning it so formatting is skipped when not logging
     """
+    if not DEBUG_LOG:
+        return
+    if callable(msg):
+        msg = msg()
     xbmc.log(f'{ADDON_NAME}: {msg}', xbmc.LOGDEBUG)
 
 # parsers to get tvshow and episode nfo data
 
-def get_matching_video(nfo_file:Path) -> Path:
+def get_matching_video(suffixes:dict[str, os.DirEntry]) -> str:
     """checks for video file matching episode nfo
     using formats from VIDEO_FORMATS
 
     Args:
-        nfo_file (Path): the episode nfo file to match
+        suffixes (dict[str, os.DirEntry]): the folder entries sharing the
+            episode nfo's stem, keyed by lower case suffix
 
     Returns:
-        Path: the matching video file
+        str: path/filename of the matching video file
     """
     for vformat in VIDEO_FORMATS:
-        if nfo_file.with_suffix(vformat).exists():
-            return nfo_file.with_suffix(vformat)
+        if vformat in suffixes:
+            return suffixes[vformat].path
     return None
 
-def parse_nfo(nfo_file:Path) -> dict:
-    """gets contents of Kodi nfo file as dict
+def read_nfo(nfo_file:str) -> dict:
+    """gets the fields used by the plugin from a Kodi nfo file
 
     Args:
-        nfo_file (Path): path/filename of nfo file
+        nfo_file (str): path/filename of nfo file
 
     Returns:
-        dict: contents of nfo file as dict
+        dict: the NFO_FIELDS as strings ('' if missing) plus 'genre' as a list
     """
-    nfo_details = xmltodict.parse(nfo_file.read_text(encoding='utf-8'))
+    root = ET.parse(nfo_file).getroot()
+    nfo_details = {field: root.findtext(field, '') for field in NFO_FIELDS}
+    nfo_details['genre'] = [genre.text for genre in root.iterfind('genre') if genre.text]
     return nfo_details
 
+class NfoCache:
+    """parsed nfo files keyed by path and modification time, kept as pickle
+    files in the addon data folder so unchanged nfo files are not parsed
+    again on later plugin calls.  All tvshow.nfo entries share one file and
+    each show folder's episodes have their own, so a listing only loads the
+    entries it uses.  Use as a context manager around the parsing; outside
+    of it nfo files are parsed without caching.
+
+    A cache file that cannot be unpickled is deleted; one that cannot be
+    read (eg busy) is left alone and its nfo files parsed directly.
+    """
+
+    def __init__(self, cache_dir:Path):
+        self.cache_dir = cache_dir
+        self.active = False
+        # cache file -> {nfo file: (mtime, nfo details)}, None if unreadable
+        self.entries:dict[str, dict | None] = {}
+        # cache file -> nfo files looked up while open
+        self.seen:dict[str, set[str]] = {}
+        # cache files with entries added or changed
+        self.changed:set[str] = set()
+        # the nfo files are parsed from worker threads
+        self.lock = threading.Lock()
+
+    def __enter__(self) -> NfoCache:
+        self.entries = {}
+        self.seen = {}
+        self.changed = set()
+        self.active = True
+        return self
+
+    def __exit__(self, *exc_info):
+        self.active = False
+        for cache_name, entries in self.entries.items():
+            # save new entries, or drop stale ones (see save)
+            if cache_name in self.changed or (
+                    entries is not None and not self.seen[cache_name].issuperset(entries)):
+                self.save(cache_name)
+        self.entries = {}
+        self.seen = {}
+
+    def cache_name(self, nfo_file:str) -> str:
+        """the cache file name for an nfo file"""
+        folder, name = os.path.split(nfo_file)
+        if name == 'tvshow.nfo':
+            return 'tvshows.pickle'
+        return f'{hashlib.sha1(folder.encode("utf-8")).hexdigest()}.pickle'
+
+    def load(self, cache_name:str) -> dict | None:
+        """reads a cache file
+
+        Args:
+            cache_name (str): the cache file name
+
+        Returns:
+            dict | None: the cached entries, None if the file cannot be read
+        """
+        cache_file = self.cache_dir / cache_name
+        try:
+            with cache_file.open('rb') as cache:
+                entries = pickle.load(cache)
+            if not isinstance(entries, dict):
+                raise pickle.UnpicklingError('not a dict')
+        except FileNotFoundError:
+            return {}
+        except OSError as exc:
+            logit(lambda: f'NfoCache unable to read {cache_file}: {exc}')
+            return None
+        except Exception as exc:
+            # the file was read but is damaged, so start it again
+            logit(lambda: f'NfoCache removing damaged {cache_file}: {exc}')
+            try:
+                cache_file.unlink()
+            except OSError:
+                pass
+            return {}
+        return entries
+
+    def save(self, cache_name:str):
+        """writes a cache file, without the entries for nfo files no longer
+        found.  A listing parses every tvshow.nfo, or every episode nfo of a
+        folder, so entries not looked up while open are stale.
+
+        Args:
+            cache_name (str): the cache file name
+        """
+        seen = self.seen[cache_name]
+        entries = {key: value for key, value in self.entries[cache_name].items() if key in seen}
+        cache_file = self.cache_dir / cache_name
+        # write then rename so another plugin call never reads a partial file
+        temp_file = cache_file.with_name(f'{cache_name}.{os.getpid()}.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with temp_file.open('wb') as cache:
+                pickle.dump(entries, cache, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except OSError as exc:
+            logit(lambda: f'NfoCache unable to write {cache_file}: {exc}')
+
+    def parse(self, nfo_file:str) -> dict:
+        """gets the parsed nfo file from the cache, parsing and storing
+        it if missing or out of date
+
+        Args:
+            nfo_file (str): path/filename of nfo file
+
+        Returns:
+            dict: as read_nfo
+        """
+        if not self.active:
+            return read_nfo(nfo_file)
+        cache_name = self.cache_name(nfo_file)
+        with self.lock:
+            if cache_name not in self.entries:
+                self.entries[cache_name] = self.load(cache_name)
+                self.seen[cache_name] = set()
+            entries = self.entries[cache_name]
+            if entries is None:
+                return read_nfo(nfo_file)
+            self.seen[cache_name].add(nfo_file)
+            entry = entries.get(nfo_file)
+        mtime = os.stat(nfo_file).st_mtime_ns
+        if entry and entry[0] == mtime:
+            return entry[1]
+        nfo_details = read_nfo(nfo_file)
+        with self.lock:
+            entries[nfo_file] = (mtime, nfo_details)
+            self.changed.add(cache_name)
+        return nfo_details
+
+NFO_CACHE = NfoCache(ADDON_PROFILE / 'nfo')
+
+def parse_nfo(nfo_file:str) -> dict:
+    """gets the fields used by the plugin from a Kodi nfo file, using
+    NFO_CACHE when it is open
+
+    Args:
+        nfo_file (str): path/filename of nfo file
+
+    Returns:
+        dict: as read_nfo
+    """
+    return NFO_CACHE.parse(nfo_file)
+
 def parse_episode_name(filename:str) -> dict:
     """gets season and episode ids from episode nfo file name
 
@@ -91,49 +271,80 @@ def parse_episode_name(filename:str) -> dict:
     Returns:
         dict: the episode as {'season': season_int, 'episode':episode_int}
     """
-    episode = {}
-    season_no = re.search(r'[sS](\d+)', filename)
-    episode_no = re.search(r'[eE](\d+)', filename)
-    if season_no and episode_no:
-        episode['season'] = season_no.group(1)
-        episode['episode'] = episode_no.group(1)
-    return episode
-
-def get_tvshow_nfo(show:Path) -> dict:
+    match = SXX_EYY_RE.search(filename)
+    if match:
+        return {'season': match.group(1), 'episode': match.group(2)}
+    return {}
+
+def get_tvshow_nfo(show_entries:list[os.DirEntry]) -> dict:
     """finds a tvshow.nfo file in folder and returns content
 
     Args:
-        show (Path): folder containing tv show
+        show_entries (list[os.DirEntry]): entries of folder containing tv show
 
     Returns:
-        dict: the tvshow.nfo as dict
+        dict: the tvshow.nfo fields as {'tvshow': fields}
     """
-    for show_file in show.iterdir():
-        if show_file.name == 'tvshow.nfo':
-            test_parse = parse_nfo(show_file)
-            return test_parse
+    for entry in show_entries:
+        if entry.name == 'tvshow.nfo':
+            return {'tvshow': parse_nfo(entry.path)}
 
-def get_episode_nfo(episodes_dir:Path) -> list[dict]:
+def iter_episodes(by_stem:dict[str, dict[str, os.DirEntry]]) -> Iterator[dict]:
+    """yields the episodes that have both an nfo and a matching video file
+
+    Args:
+        by_stem (dict[str, dict[str, os.DirEntry]]): episode folder entries
+            keyed by stem then by suffix
+
+    Yields:
+        dict: the episode with its video in 'url' and the path/filename
+            of its nfo file in 'nfo'
+    """
+    for stem, suffixes in by_stem.items():
+        if '.nfo' not in suffixes:
+            continue
+        episode = parse_episode_name(stem)
+        if not episode:
+            continue
+        video = get_matching_video(suffixes)
+        if video is None:
+            continue
+        episode['url'] = video
+        episode['nfo'] = suffixes['.nfo'].path
+        yield episode
+
+def get_episode_nfo(episodes_dir:str) -> list[dict]:
     """finds a set of episode.nfo files and returns content
 
     Args:
-        episodes (Path): folder containing episodes
+        episodes_dir (str): folder containing episodes
 
     Returns:
-        list[dict]: a list of episodes -- each episode is a dict
+        list[dict]: a list of episodes -- each episode is a dict with the
+            video file path/filename as a str in 'url'
     """
-    logit(f'get_episode_nfo from {episodes_dir}')
-    episode_list = []
-    for episode_file in episodes_dir.iterdir():
-        if episode_file.suffix == '.nfo':
-            episode = parse_episode_name(episode_file.stem)
-            if episode:
-                video = get_matching_video(episode_file)
-                if video:
-                    episode['url'] = video
-                    episode['details'] = parse_nfo(episode_file)
-                    episode_list.append(episode)
-    logit(f'get_episode_info episode list len {len(episode_list)}')
+    logit(lambda: f'get_episode_nfo from {episodes_dir}')
+    # one pass over the folder, grouping entries by stem so matching
+    # video files are found without a stat() per video format
+    by_stem:dict[str, dict[str, os.DirEntry]] = {}
+    with os.scandir(episodes_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            dot = name.rfind('.')
+            # suffixes are matched case-insensitively, eg 'S01E01.MKV'
+            suffix = name[dot:].lower()
+            if dot > 0 and suffix in EPISODE_SUFFIXES:
+                by_stem.setdefault(name[:dot], {})[suffix] = entry
+    episode_list = list(iter_episodes(by_stem))
+    if not episode_list:
+        logit('get_episode_info no episodes')
+        return episode_list
+    # the nfo files are independent so read and parse them concurrently
+    with NFO_CACHE, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        details = executor.map(parse_nfo, (episode['nfo'] for episode in episode_list))
+        for episode, nfo_details in zip(episode_list, details):
+            episode['details'] = nfo_details
+    logit(lambda: f'get_episode_info episode list len {len(episode_list)}')
     return episode_list
 
 def add_show_data(infoTag:xbmc.InfoTagVideo, show_info:dict) -> xbmc.InfoTagVideo:
@@ -173,25 +384,53 @@ def get_url(**kwargs):
     """
     Create a URL for calling the plugin recursively from the given set of keyword arguments.
 
-    :param kwargs: "argument=value" pairs
+    :param kwargs: "argument=value" pairs, values must be str
     :return: plugin call URL
     :rtype: str
     """
-    return f'{URL}?{urllib.parse.urlencode(kwargs, quote_via=urllib.parse.quote)}'
+    # same output as urlencode(kwargs, quote_via=quote), but values made
+    # only of unreserved characters are used as is instead of quoted
+    params = []
+    for key, value in kwargs.items():
+        if not URL_SAFE_CHARS.issuperset(value):
+            value = urllib.parse.quote(value, safe='')
+        params.append(f'{key}={value}')
+    return f'{URL}?{"&".join(params)}'
+
+def get_art(show_entries:list[os.DirEntry]) -> dict[str, str]:
+    """finds local art for each of ART_TYPES in one pass
+
+    Args:
+        show_entries (list[os.DirEntry]): entries of tv show folder with local art
+
+    Returns:
+        dict[str, str]: path/filename of image file keyed by arttype, ready
+            for ListItem.setArt
+    """
+    art = {}
+    for entry in show_entries:
+        art_type, suffix = os.path.splitext(entry.name)
+        if suffix.lower() in ART_FORMATS and art_type in ART_TYPES and art_type not in art:
+            art[art_type] = entry.path
+    return art
 
-def get_art(art_type:str, art_dir:Path) -> Path:
-    """finds local art for an artype
+def load_show(show:str) -> dict:
+    """gets the nfo data and local art for a tv show
 
     Args:
-        art_type (str): the arttype eg poster/fanart
-        art_dir (Path): tv show folder with local art
+        show (str): the tv show folder
 
     Returns:
-        Path: path/filename of image file
+        dict: the show as {'tvshow': fields, 'art': art, 'dir': show}
     """
-    for file in art_dir.iterdir():
-        if file.stem == art_type and (file.suffix == '.jpg' or '.png'):
-            return file
+    logit(lambda: f'load_show get info for {show}')
+    # list the folder once for both the nfo and the art
+    with os.scandir(show) as entries:
+        show_entries = list(entries)
+    show_data = get_tvshow_nfo(show_entries)
+    show_data['art'] = get_art(show_entries)
+    show_data['dir'] = show
+    return show_data
 
 def get_shows() ->list[dict]:
     """gets a list of tv shows to display
@@ -199,26 +438,22 @@ def get_shows() ->list[dict]:
     Returns:
         list: the tv shows
     """
-    shows = []
-    for show in SHOW_PATH.iterdir():
-        if show.is_dir():
-            logit(f'get_shows get info for {show}')
-            show_data = get_tvshow_nfo(show)
-            show_data['art'] = {}
-            for art_type in ('banner', 'fanart', 'poster'):
-                art = get_art(art_type, show)
-                if art:
-                    show_data['art'][art_type] = art
-            show_data['dir'] = show
-            shows.append(show_data)
-    logit(f'get_shows total is {len(shows)}')
+    with os.scandir(SHOW_PATH) as entries:
+        show_dirs = [entry.path for entry in entries if entry.is_dir()]
+    if not show_dirs:
+        logit('get_shows no show folders')
+        return []
+    # each show folder is independent so load them concurrently
+    with NFO_CACHE, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        shows = list(executor.map(load_show, show_dirs))
+    logit(lambda: f'get_shows total is {len(shows)}')
     return shows
 
-def get_episodes(show_dir:Path) ->list[dict]:
+def get_episodes(show_dir:str) ->list[dict]:
     """gets a list of tv shows to display
 
     Args:
-        show_dir (Path): the tv show folder containing episodes
+        show_dir (str): the tv show folder containing episodes
 
     Returns:
         list: the episodes
@@ -230,46 +465,62 @@ def list_shows():
     """creates a Kodi container of tv show listitems.  The url gets
     Kodi container of episodes 
     """
-        # Set plugin category. It is displayed in some skins as the name
+    shows = get_shows()
+    if not shows:
+        # Nothing to list, so just finish the empty virtual folder.
+        xbmcplugin.endOfDirectory(HANDLE)
+        return
+    # Set plugin category. It is displayed in some skins as the name
     # of the current section.
     xbmcplugin.setPluginCategory(HANDLE, 'TV Shows ')
     # Set plugin content. It allows Kodi to select appropriate views
     # for this type of content.
     xbmcplugin.setContent(HANDLE, 'tvshows')
-    shows = get_shows()
+    items:list[tuple[str, xbmcgui.ListItem, bool]] = []
     for show_info in shows:
+        tvshow = show_info['tvshow']
+        # fall back to the folder name so the item label and url are never
+        # blank (parse_params drops blank values)
+        title = tvshow.get('title') or os.path.basename(show_info['dir'])
         # Create a list item with a text label.
-        list_item = xbmcgui.ListItem(label=show_info['tvshow']['title'])
+        list_item = xbmcgui.ListItem(label=title)
         # Set images for the list item.
-        list_item.setArt({'poster': str(show_info['art']['poster']), 'fanart': str(show_info['art']['fanart'])})
+        list_item.setArt(show_info['art'])
         # Set additional info for the list item using its InfoTag.
         # InfoTag allows to set various information for an item.
         # For available properties and methods see the following link:
         # https://codedocs.xyz/xbmc/xbmc/classXBMCAddon_1_1xbmc_1_1InfoTagVideo.html
         # 'mediatype' is needed for a skin to display info for this ListItem correctly.
         info_tag:xbmc.InfoTagVideo = list_item.getVideoInfoTag()
-        add_show_data(info_tag, show_info['tvshow'])
+        add_show_data(info_tag, tvshow)
+        # use the same title as the label when the nfo has none
+        info_tag.setTitle(title)
         # Create a URL for a plugin recursive call.
         # Example: plugin://plugin.video.example/?action=listing&genre_index=0
-        url = get_url(action='listing', show_dir=str(show_info['dir']), show_title=show_info['tvshow']['title'])
+        url = get_url(action='listing', show_dir=show_info['dir'], show_title=title)
         # is_folder = True means that this item opens a sub-list of lower level items.
         is_folder = True
-        # Add our item to the Kodi virtual folder listing.
-        xbmcplugin.addDirectoryItem(HANDLE, url, list_item, is_folder)
+        items.append((url, list_item, is_folder))
+    # Add all items to the Kodi virtual folder listing in one call.
+    xbmcplugin.addDirectoryItems(HANDLE, items, len(items))
     # Add sort methods for the virtual folder items
     xbmcplugin.addSortMethod(HANDLE, xbmcplugin.SORT_METHOD_LABEL_IGNORE_THE)
     # Finish creating a virtual folder.
     xbmcplugin.endOfDirectory(HANDLE)
 
-def list_episodes(show_path:Path, show_title:str):
+def list_episodes(show_path:str, show_title:str):
     """
     Create the list of playable videos in the Kodi interface.
 
     :param genre_index: the index of genre in the list of movie genres
     :type genre_index: int
     """
-    logit(f'list_episodes for {show_path} and {show_title}')
+    logit(lambda: f'list_episodes for {show_path} and {show_title}')
     episodes = get_episodes(show_path)
+    if not episodes:
+        # Nothing to list, so just finish the empty virtual folder.
+        xbmcplugin.endOfDirectory(HANDLE)
+        return
     # Set plugin category. It is displayed in some skins as the name
     # of the current section.
     xbmcplugin.setPluginCategory(HANDLE, show_title)
@@ -277,14 +528,15 @@ def list_episodes(show_path:Path, show_title:str):
     # for this type of content.
     xbmcplugin.setContent(HANDLE, 'episodes')
     # Get the list of videos in the category.
+    items:list[tuple[str, xbmcgui.ListItem, bool]] = []
     for video in episodes:
         # Create a list item with a text label
-        list_item = xbmcgui.ListItem(label=video['details']['episodedetails']['title'])
+        list_item = xbmcgui.ListItem(label=video['details']['title'])
         # Set graphics (thumbnail, fanart, banner, poster, landscape etc.) for the list item.
         # Set additional info for the list item via InfoTag.
         # 'mediatype' is needed for skin to display info for this ListItem correctly.
         info_tag:xbmc.InfoTagVideo = list_item.getVideoInfoTag()
-        add_episode_data(info_tag, video['details']['episodedetails'])
+        add_episode_data(info_tag, video['details'])
         # Set 'IsPlayable' property to 'true'.
         # This is mandatory for playable items!
         list_item.setProperty('IsPlayable', 'true')
@@ -294,8 +546,9 @@ def list_episodes(show_path:Path, show_title:str):
         # Add the list item to a virtual Kodi folder.
         # is_folder = False means that this item won't open any sub-list.
         is_folder = False
-        # Add our item to the Kodi virtual folder listing.
-        xbmcplugin.addDirectoryItem(HANDLE, url, list_item, is_folder)
+        items.append((url, list_item, is_folder))
+    # Add all items to the Kodi virtual folder listing in one call.
+    xbmcplugin.addDirectoryItems(HANDLE, items, len(items))
     # Add sort methods for the virtual folder items
     xbmcplugin.addSortMethod(HANDLE, xbmcplugin.SORT_METHOD_LABEL_IGNORE_THE)
     xbmcplugin.addSortMethod(HANDLE, xbmcplugin.SORT_METHOD_VIDEO_YEAR)
@@ -319,6 +572,37 @@ def play_video(path):
     xbmcplugin.setResolvedUrl(HANDLE, True, listitem=play_item)
 
 
+def parse_params(paramstring:str) -> dict[str, str]:
+    """parses the plugin paramstring built by get_url, a cheaper
+    equivalent of dict(urllib.parse.parse_qsl(paramstring))
+
+    Args:
+        paramstring (str): URL encoded plugin paramstring
+
+    Returns:
+        dict[str, str]: the {<parameter>: <value>} elements
+    """
+    params = {}
+    if not paramstring:
+        return params
+    for param in paramstring.split('&'):
+        key, sep, value = param.partition('=')
+        # like parse_qsl, skip fields without a value
+        if not (sep and value):
+            continue
+        if '%' in value or '+' in value:
+            value = urllib.parse.unquote_plus(value)
+        params[key] = value
+    return params
+
+# plugin actions called by router with the parsed params
+ACTIONS = {
+    # Display the list of episodes in a provided tv show.
+    'listing': lambda params: list_episodes(params['show_dir'], params.get('show_title', '')),
+    # Play a video from a provided URL.
+    'play': lambda params: play_video(params['video']),
+}
+
 def router(paramstring):
     """
     Router function that calls other functions
@@ -329,9 +613,9 @@ def router(paramstring):
     """
     # Parse a URL-encoded paramstring to the dictionary of
     # {<parameter>: <value>} elements
-    params = dict(urllib.parse.parse_qsl(paramstring))
+    params = parse_params(paramstring)
     if params:
-        logit(f'router params {params}')
+        logit(lambda: f'router params {params}')
     else:
         logit('router no params')
     # Check the parameters passed to the plugin
@@ -339,18 +623,14 @@ def router(paramstring):
         # If the plugin is called from Kodi UI without any parameters,
         # display the list of tv shows
         list_shows()
-    elif params['action'] == 'listing':
-        # Display the list of episodes in a provided tv show.
-        list_episodes(Path(params['show_dir']), params['show_title'])
-    elif params['action'] == 'play':
-        # Play a video from a provided URL.
-        play_video(params['video'])
-    else:
+        return
+    action = ACTIONS.get(params.get('action'))
+    if action is None:
         # If the provided paramstring does not contain a supported action
         # we raise an exception. This helps to catch coding errors,
         # e.g. typos in action names.
         raise ValueError(f'Invalid paramstring: {paramstring}!')
-
+    action(params)
 
 if __name__ == '__main__':
     # Call the router function and pass the plugin call parameters to it.